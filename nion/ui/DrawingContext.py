@@ -7,9 +7,9 @@
 
 # standard libraries
 import base64
-import collections
+import concurrent.futures
 from contextlib import contextmanager
-import copy
+import functools
 import io
 import logging
 import math
@@ -22,14 +22,16 @@ import typing
 import xml.sax.saxutils
 
 # third party libraries
-import imageio
 import numpy
+import PIL.Image
 
 # local libraries
 # None
 
 # pylint: disable=star-args
 
+_DEGREES_PER_RADIAN = 180.0 / math.pi
+
 
 def get_rgba_view_from_rgba_data(rgba_data):
     return rgba_data.view(numpy.uint8).reshape(rgba_data.shape + (4,))
@@ -87,6 +89,649 @@ def get_alpha_view(rgba_image, byteorder=None):
         return bytes[..., 0]  # A of ARGB
 
 
+def _js_save(command, js_parts):
+    js_parts.append("ctx.save();")
+
+
+def _js_restore(command, js_parts):
+    js_parts.append("ctx.restore();")
+
+
+def _js_begin_path(command, js_parts):
+    js_parts.append("ctx.beginPath();")
+
+
+def _js_close_path(command, js_parts):
+    js_parts.append("ctx.closePath();")
+
+
+def _js_clip(command, js_parts):
+    js_parts.append("ctx.beginPath();")
+    _, x, y, w, h = command
+    js_parts.append(f"ctx.rect({x}, {y}, {w}, {h});")
+    js_parts.append("ctx.clip();")
+
+
+def _js_translate(command, js_parts):
+    _, x, y = command
+    js_parts.append(f"ctx.translate({x}, {y});")
+
+
+def _js_scale(command, js_parts):
+    _, x, y = command
+    js_parts.append(f"ctx.scale({x}, {y});")
+
+
+def _js_rotate(command, js_parts):
+    js_parts.append(f"ctx.rotate({command[1]});")
+
+
+def _js_move_to(command, js_parts):
+    _, x, y = command
+    js_parts.append(f"ctx.moveTo({x}, {y});")
+
+
+def _js_line_to(command, js_parts):
+    _, x, y = command
+    js_parts.append(f"ctx.lineTo({x}, {y});")
+
+
+def _js_rect(command, js_parts):
+    _, x, y, w, h = command
+    js_parts.append(f"ctx.rect({x}, {y}, {w}, {h});")
+
+
+def _js_arc(command, js_parts):
+    _, x, y, r, sa, ea, ac = command
+    js_parts.append(f"ctx.arc({x}, {y}, {r}, {sa}, {ea}, {'true' if ac else 'false'});")
+
+
+def _js_arc_to(command, js_parts):
+    _, x1, y1, x2, y2, r = command
+    js_parts.append(f"ctx.arcTo({x1}, {y1}, {x2}, {y2}, {r});")
+
+
+def _js_cubic_to(command, js_parts):
+    _, x1, y1, x2, y2, x, y = command
+    js_parts.append(f"ctx.bezierCurveTo({x1}, {y1}, {x2}, {y2}, {x}, {y});")
+
+
+def _js_quadratic_to(command, js_parts):
+    _, x1, y1, x, y = command
+    js_parts.append(f"ctx.quadraticCurveTo({x1}, {y1}, {x}, {y});")
+
+
+def _js_image(command, js_parts):
+    _, w, h, image, image_id, a, b, c, d = command
+    js_parts.append(f"ctx.rect({a}, {b}, {c}, {d});")
+
+
+def _js_data(command, js_parts):
+    _, w, h, data, data_id, a, b, c, d, low, high, color_table, color_table_image_id = command
+    js_parts.append(f"ctx.rect({a}, {b}, {c}, {d});")
+
+
+def _js_stroke(command, js_parts):
+    js_parts.append("ctx.stroke();")
+
+
+def _js_fill(command, js_parts):
+    js_parts.append("ctx.fill();")
+
+
+def _js_fill_text(command, js_parts):
+    _, text, x, y, max_width = command
+    max_width_str = f", {max_width}" if max_width else ""
+    js_parts.append(f"ctx.fillText('{xml.sax.saxutils.escape(text)}', {x}, {y}{max_width_str});")
+
+
+def _js_fill_style_gradient(command, js_parts):
+    js_parts.append(f"ctx.fillStyle = grad{command[1]};")
+
+
+def _js_fill_style(command, js_parts):
+    js_parts.append(f"ctx.fillStyle = '{command[1]}';")
+
+
+def _js_font(command, js_parts):
+    js_parts.append(f"ctx.font = '{command[1]}';")
+
+
+def _js_text_align(command, js_parts):
+    js_parts.append(f"ctx.textAlign = '{command[1]}';")
+
+
+def _js_text_baseline(command, js_parts):
+    js_parts.append(f"ctx.textBaseline = '{command[1]}';")
+
+
+def _js_stroke_style(command, js_parts):
+    js_parts.append(f"ctx.strokeStyle = '{command[1]}';")
+
+
+def _js_line_width(command, js_parts):
+    js_parts.append(f"ctx.lineWidth = {command[1]};")
+
+
+def _js_line_dash(command, js_parts):
+    js_parts.append(f"ctx.lineDash = {command[1]};")
+
+
+def _js_line_cap(command, js_parts):
+    js_parts.append(f"ctx.lineCap = '{command[1]}';")
+
+
+def _js_line_join(command, js_parts):
+    js_parts.append(f"ctx.lineJoin = '{command[1]}';")
+
+
+def _js_gradient(command, js_parts):
+    _, command_var, width, height, x1, y1, x2, y2 = command  # pylint: disable=invalid-name
+    js_parts.append(f"var grad{command_var} = ctx.createLinearGradient({x1}, {y1}, {x2 - x1}, {y2 - y1});")
+
+
+def _js_color_stop(command, js_parts):
+    _, command_var, x, color = command
+    js_parts.append(f"grad{command_var}.addColorStop({x}, '{color}');")
+
+
+_JS_DISPATCH = {
+    "save": _js_save,
+    "restore": _js_restore,
+    "beginPath": _js_begin_path,
+    "closePath": _js_close_path,
+    "clip": _js_clip,
+    "translate": _js_translate,
+    "scale": _js_scale,
+    "rotate": _js_rotate,
+    "moveTo": _js_move_to,
+    "lineTo": _js_line_to,
+    "rect": _js_rect,
+    "arc": _js_arc,
+    "arcTo": _js_arc_to,
+    "cubicTo": _js_cubic_to,
+    "quadraticTo": _js_quadratic_to,
+    "image": _js_image,
+    "data": _js_data,
+    "stroke": _js_stroke,
+    "fill": _js_fill,
+    "fillText": _js_fill_text,
+    "fillStyleGradient": _js_fill_style_gradient,
+    "fillStyle": _js_fill_style,
+    "font": _js_font,
+    "textAlign": _js_text_align,
+    "textBaseline": _js_text_baseline,
+    "strokeStyle": _js_stroke_style,
+    "lineWidth": _js_line_width,
+    "lineDash": _js_line_dash,
+    "lineCap": _js_line_cap,
+    "lineJoin": _js_line_join,
+    "gradient": _js_gradient,
+    "colorStop": _js_color_stop,
+    # commands which do not draw anything map to None and are skipped without a call.
+    "sleep": None,  # used for performance testing
+    "latency": None,
+    "message": None,
+    "timestamp": None,
+    "statistics": None,
+}
+
+
+class _SVGState:
+    """Mutable state shared by the svg command handlers during a single call to to_svg."""
+
+    __slots__ = ("svg_parts", "defs_parts", "path_parts", "next_clip_id", "transform", "closers", "fill_style",
+                 "fill_opacity", "stroke_style", "stroke_opacity", "line_cap", "line_join", "line_width", "line_dash",
+                 "text_anchor", "text_baseline", "font_style", "font_weight", "font_size", "font_unit", "font_family",
+                 "undo_stack", "gradient_start", "gradient_stops", "gradient_ids", "transform_str",
+                 "font_str", "encoded_images")
+
+    def __init__(self, encoded_images: typing.Dict[int, str]):
+        self.svg_parts = list()
+        self.defs_parts = list()
+        self.path_parts = list()
+        self.next_clip_id = 1
+        self.transform = list()
+        self.closers = list()
+        self.fill_style = None
+        self.fill_opacity = 1.0
+        self.stroke_style = None
+        self.stroke_opacity = 1.0
+        self.line_cap = "square"
+        self.line_join = "bevel"
+        self.line_width = 1.0
+        self.line_dash = None
+        self.text_anchor = "start"
+        self.text_baseline = "alphabetic"
+        self.font_style = None
+        self.font_weight = None
+        self.font_size = None
+        self.font_unit = None
+        self.font_family = None
+        self.undo_stack = list()
+        self.gradient_start = None
+        self.gradient_stops = list()
+        self.gradient_ids = dict()
+        self.transform_str = None
+        self.font_str = None
+        self.encoded_images = encoded_images
+
+
+# svg attribute values are written in single quotes
+_SVG_ATTRIBUTE_ENTITIES = {"'": "&apos;", "\"": "&quot;"}
+
+
+def _escape_svg_attribute(value: str) -> str:
+    return xml.sax.saxutils.escape(value, _SVG_ATTRIBUTE_ENTITIES)
+
+
+# make a SVG 1.1 compatible color, opacity tuple
+def _parse_svg_color(color_str: str) -> typing.Tuple[str, float]:
+    color_str = ''.join(color_str.split())
+    if color_str.startswith("rgba"):
+        c = re.split("rgba\((\d+),(\d+),(\d+),([\d.]+)\)", color_str)
+        return f"rgb({c[1]}, {c[2]}, {c[3]})", float(c[4])
+    return _escape_svg_attribute(color_str), 1.0
+
+
+def _svg_transform_str(state):
+    # cached until the transform changes
+    transform_str = state.transform_str
+    if transform_str is None:
+        transform_str = f" transform='{' '.join(state.transform)}'" if len(state.transform) > 0 else ""
+        state.transform_str = transform_str
+    return transform_str
+
+
+def _svg_font_str(state):
+    # cached until the font or fill changes
+    font_str = state.font_str
+    if font_str is None:
+        font_str = ""
+        if state.font_style:
+            font_str += f" font-style='{state.font_style}'"
+        if state.font_weight:
+            font_str += f" font-weight='{state.font_weight}'"
+        if state.font_size:
+            font_str += f" font-size='{state.font_size}{state.font_unit}'"
+        if state.font_family:
+            font_str += f" font-family='{state.font_family}'"
+        if state.fill_style:
+            font_str += f" fill='{state.fill_style}'"
+        if state.fill_opacity < 1.0:
+            font_str += f" fill-opacity='{state.fill_opacity}'"
+        state.font_str = font_str
+    return font_str
+
+
+def _svg_set(state, name, value):
+    # record the previous value so restore can undo the change; nothing to record outside of a save.
+    if state.undo_stack:
+        state.undo_stack.append((name, getattr(state, name)))
+    setattr(state, name, value)
+
+
+def _svg_save(command, state):
+    # the marker records the path and transform positions and the closers; other state changes are
+    # recorded individually by _svg_set as they happen.
+    state.undo_stack.append((None, state.path_parts, len(state.path_parts), len(state.transform), state.closers))
+    state.closers = list()
+
+
+def _svg_restore(command, state):
+    state.svg_parts.extend(state.closers)
+    undo_stack = state.undo_stack
+    record = undo_stack.pop()
+    while record[0] is not None:
+        setattr(state, record[0], record[1])
+        record = undo_stack.pop()
+    _, path_parts, path_length, transform_length, closers = record
+    # paths and transforms are only appended to between save and restore, so truncating them restores them.
+    del path_parts[path_length:]
+    del state.transform[transform_length:]
+    state.path_parts = path_parts
+    state.closers = closers
+    state.transform_str = None
+    state.font_str = None
+
+
+def _svg_begin_path(command, state):
+    state.path_parts = list()
+
+
+def _svg_close_path(command, state):
+    state.path_parts.append(" Z")
+
+
+def _svg_move_to(command, state):
+    _, x, y = command
+    state.path_parts.append(f" M {x} {y}")
+
+
+def _svg_line_to(command, state):
+    _, x, y = command
+    state.path_parts.append(f" L {x} {y}")
+
+
+def _svg_rect(command, state):
+    _, x, y, w, h = command
+    r = x + w
+    b = y + h
+    state.path_parts.append(f" M {x} {y} L {r} {y} L {r} {b} L {x} {b} Z")
+
+
+def _svg_cubic_to(command, state):
+    _, x1, y1, x2, y2, x, y = command
+    state.path_parts.append(f" C {x1} {y1}, {x2} {y2}, {x} {y}")
+
+
+def _svg_quadratic_to(command, state):
+    _, x1, y1, x, y = command
+    state.path_parts.append(f" Q {x1} {y1}, {x} {y}")
+
+
+def _svg_clip(command, state):
+    _, x, y, w, h = command
+    clip_id = f"clip{state.next_clip_id}"
+    state.next_clip_id += 1
+    transform_str = _svg_transform_str(state)
+    state.defs_parts.append(f"<clipPath id='{clip_id}'><rect x='{x}' y='{y}' width='{w}' height='{h}'{transform_str} /></clipPath>")
+    state.svg_parts.append(f"<g style='clip-path: url(#{clip_id});'>")
+    state.closers.append("</g>")
+
+
+def _svg_translate(command, state):
+    _, x, y = command
+    state.transform.append(f"translate({x},{y})")
+    state.transform_str = None
+
+
+def _svg_scale(command, state):
+    _, x, y = command
+    state.transform.append(f"scale({x},{y})")
+    state.transform_str = None
+
+
+def _svg_rotate(command, state):
+    state.transform.append(f"rotate({command[1]})")
+    state.transform_str = None
+
+
+def _encode_image_png(command) -> str:
+    _, w, h, image, image_id, a, b, c, d = command
+    png_file = io.BytesIO()
+    # let pillow unpack the packed uint32 pixels directly rather than reordering the channels into a copy.
+    raw_mode = "BGRA" if sys.byteorder == "little" else "ARGB"
+    pil_image = PIL.Image.frombuffer("RGBA", (image.shape[1], image.shape[0]), numpy.ascontiguousarray(image), "raw", raw_mode, 0, 1)
+    # favor encoding speed; the payload is regenerated for every new image.
+    pil_image.save(png_file, "PNG", compress_level=1)
+    return base64.b64encode(png_file.getvalue()).decode('utf=8')
+
+
+def _encode_data_png(command) -> str:
+    _, w, h, data, data_id, a, b, c, d, low, high, color_table, color_table_image_id = command
+    m = 255.0 / (high - low) if high != low else 1
+    image = numpy.empty(data.shape, numpy.uint32)
+    if color_table is not None:
+        adj_color_table = numpy.empty(color_table.shape, numpy.uint32)
+        # ordering of color_table is BGRA
+        # ordering of adj_color_table is RGBA
+        get_byte_view(adj_color_table)[:, 0] = get_byte_view(color_table)[:, 2]
+        get_byte_view(adj_color_table)[:, 1] = get_byte_view(color_table)[:, 1]
+        get_byte_view(adj_color_table)[:, 2] = get_byte_view(color_table)[:, 0]
+        get_byte_view(adj_color_table)[:, 3] = get_byte_view(color_table)[:, 3]
+        clipped_array = numpy.clip((m * (data - low)).astype(int), 0, 255).astype(numpy.uint8)
+        image[:] = adj_color_table[clipped_array]
+    else:
+        clipped_array = numpy.clip(data, low, high)
+        numpy.subtract(clipped_array, low, out=clipped_array)
+        numpy.multiply(clipped_array, m, out=clipped_array)
+        get_red_view(image)[:] = clipped_array
+        get_green_view(image)[:] = clipped_array
+        get_blue_view(image)[:] = clipped_array
+        get_alpha_view(image)[:] = 255
+    png_file = io.BytesIO()
+    # the bytes of image are already in RGBA order, so pillow can wrap the buffer as is.
+    pil_image = PIL.Image.frombuffer("RGBA", (image.shape[1], image.shape[0]), image, "raw", "RGBA", 0, 1)
+    pil_image.save(png_file, "PNG", compress_level=1)
+    return base64.b64encode(png_file.getvalue()).decode('utf=8')
+
+
+# image and data commands both carry their image id at index 4.
+_PNG_ENCODERS = {"image": _encode_image_png, "data": _encode_data_png}
+
+
+def _encode_png(command) -> str:
+    return _PNG_ENCODERS[command[0]](command)
+
+
+_PNG_EXECUTOR_MAX_WORKERS = 4
+_png_executor = None
+_png_executor_lock = threading.Lock()
+
+
+def _get_png_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # the executor is shared and created on first use so that repeated serializations do not pay for
+    # starting and stopping threads.
+    global _png_executor
+    with _png_executor_lock:
+        if _png_executor is None:
+            _png_executor = concurrent.futures.ThreadPoolExecutor(max_workers=_PNG_EXECUTOR_MAX_WORKERS, thread_name_prefix="png")
+        return _png_executor
+
+
+def _encode_pngs(commands, encoded_images: typing.Dict[int, str]) -> None:
+    # encode the images not already in encoded_images. png compression runs in zlib which releases
+    # the gil, so several images are encoded concurrently.
+    pending_commands = [command for command in commands if command[0] in _PNG_ENCODERS and command[4] not in encoded_images]
+    if len(pending_commands) > 1:
+        executor = _get_png_executor()
+        for command, png_encoded in zip(pending_commands, executor.map(_encode_png, pending_commands)):
+            encoded_images[command[4]] = png_encoded
+
+
+def _svg_png_encoded(command, state) -> str:
+    image_id = command[4]
+    png_encoded = state.encoded_images.get(image_id)
+    if png_encoded is None:
+        png_encoded = _encode_png(command)
+        state.encoded_images[image_id] = png_encoded
+    return png_encoded
+
+
+def _svg_image(command, state):
+    _, w, h, image, image_id, a, b, c, d = command
+    png_encoded = _svg_png_encoded(command, state)
+    transform_str = _svg_transform_str(state)
+    state.svg_parts.append(f"<image x='{a}' y='{b}' width='{c}' height='{d}' xlink:href='data:image/png;base64,{png_encoded}'{transform_str} />")
+
+
+def _svg_data(command, state):
+    _, w, h, data, data_id, a, b, c, d, low, high, color_table, color_table_image_id = command
+    png_encoded = _svg_png_encoded(command, state)
+    transform_str = _svg_transform_str(state)
+    state.svg_parts.append(f"<image x='{a}' y='{b}' width='{c}' height='{d}' xlink:href='data:image/png;base64,{png_encoded}'{transform_str} />")
+
+
+def _svg_stroke(command, state):
+    if state.stroke_style is not None:
+        path = "".join(state.path_parts)
+        transform_str = _svg_transform_str(state)
+        line_dash = state.line_dash
+        dash_str = f" stroke-dasharray='{line_dash}, {line_dash}'" if line_dash else ""
+        state.svg_parts.append(f"<path d='{path}' fill='none' stroke='{state.stroke_style}' stroke-opacity='{state.stroke_opacity}' stroke-width='{state.line_width}' stroke-linejoin='{state.line_join}' stroke-linecap='{state.line_cap}'{dash_str}{transform_str} />")
+
+
+def _svg_fill(command, state):
+    if state.fill_style is not None:
+        path = "".join(state.path_parts)
+        transform_str = _svg_transform_str(state)
+        state.svg_parts.append(f"<path d='{path}' fill='{state.fill_style}' fill-opacity='{state.fill_opacity}' stroke='none'{transform_str} />")
+
+
+def _svg_fill_text(command, state):
+    _, text, x, y, max_width = command
+    transform_str = _svg_transform_str(state)
+    font_str = _svg_font_str(state)
+    state.svg_parts.append(f"<text x='{x}' y='{y}' text-anchor='{state.text_anchor}' alignment-baseline='{state.text_baseline}'{font_str}{transform_str}>{xml.sax.saxutils.escape(text)}</text>")
+
+
+def _svg_fill_style_gradient(command, state):
+    # structurally identical gradients share a single definition.
+    command_var = command[1]
+    gradient_key = (state.gradient_start, tuple(state.gradient_stops))
+    grad_id = state.gradient_ids.get(gradient_key)
+    if grad_id is None:
+        grad_id = f"grad{command_var}"
+        state.defs_parts.append(f"<linearGradient id='{grad_id}'{state.gradient_start}>{''.join(state.gradient_stops)}</linearGradient>")
+        state.gradient_ids[gradient_key] = grad_id
+    state.gradient_start = None
+    state.gradient_stops = list()
+    _svg_set(state, "fill_style", f"url(#{grad_id})")
+    state.font_str = None
+
+
+def _svg_fill_style(command, state):
+    fill_style, fill_opacity = _parse_svg_color(command[1])
+    _svg_set(state, "fill_style", fill_style)
+    _svg_set(state, "fill_opacity", fill_opacity)
+    state.font_str = None
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_svg_font(font: str) -> typing.Tuple[typing.Optional[str], typing.Optional[str], typing.Optional[int], typing.Optional[str], typing.Optional[str]]:
+    # a ui typically uses a handful of distinct fonts, so parse each one only once.
+    font_style = None
+    font_weight = None
+    font_size = None
+    font_unit = None
+    font_family = None
+    for font_part in [s for s in font.split(" ") if s]:
+        if font_part == "italic":
+            font_style = "italic"
+        elif font_part == "bold":
+            font_weight = "bold"
+        elif font_part.endswith("px") and int(font_part[0:-2]) > 0:
+            font_size = int(font_part[0:-2])
+            font_unit = "px"
+        elif font_part.endswith("pt") and int(font_part[0:-2]) > 0:
+            font_size = int(font_part[0:-2])
+            font_unit = "pt"
+        else:
+            font_family = _escape_svg_attribute(font_part)
+    return font_style, font_weight, font_size, font_unit, font_family
+
+
+def _svg_font(command, state):
+    font_style, font_weight, font_size, font_unit, font_family = _parse_svg_font(command[1])
+    _svg_set(state, "font_style", font_style)
+    _svg_set(state, "font_weight", font_weight)
+    _svg_set(state, "font_size", font_size)
+    _svg_set(state, "font_unit", font_unit)
+    _svg_set(state, "font_family", font_family)
+    state.font_str = None
+
+
+_SVG_TEXT_ANCHORS = {"start": "start", "end": "end", "left": "start", "center": "middle", "right": "end"}
+
+_SVG_TEXT_BASELINES = {"top": "hanging", "hanging": "hanging", "middle": "middle", "alphabetic": "alphabetic",
+                       "ideaographic": "ideaographic", "bottom": "bottom"}
+
+_SVG_LINE_CAPS = {"square": "square", "round": "round", "butt": "butt"}
+
+_SVG_LINE_JOINS = {"round": "round", "miter": "miter", "bevel": "bevel"}
+
+
+def _svg_text_align(command, state):
+    _svg_set(state, "text_anchor", _SVG_TEXT_ANCHORS.get(command[1], "start"))
+
+
+def _svg_text_baseline(command, state):
+    _svg_set(state, "text_baseline", _SVG_TEXT_BASELINES.get(command[1], "alphabetic"))
+
+
+def _svg_stroke_style(command, state):
+    stroke_style, stroke_opacity = _parse_svg_color(command[1])
+    _svg_set(state, "stroke_style", stroke_style)
+    _svg_set(state, "stroke_opacity", stroke_opacity)
+
+
+def _svg_line_width(command, state):
+    _svg_set(state, "line_width", command[1])
+
+
+def _svg_line_dash(command, state):
+    _svg_set(state, "line_dash", command[1])
+
+
+def _svg_line_cap(command, state):
+    _svg_set(state, "line_cap", _SVG_LINE_CAPS.get(command[1], "square"))
+
+
+def _svg_line_join(command, state):
+    _svg_set(state, "line_join", _SVG_LINE_JOINS.get(command[1], "bevel"))
+
+
+def _svg_gradient(command, state):
+    # assumes that gradient will be used immediately after being
+    # declared and stops being defined. this is currently enforced by
+    # the way the commands are generated in drawing context.
+    _, command_var, w, h, x1, y1, x2, y2 = command
+    state.gradient_stops = list()
+    state.gradient_start = f" x1='{float(x1 / w)}' y1='{float(y1 / h)}' x2='{float(x2 / w)}' y2='{float(y2 / h)}'"
+
+
+def _svg_unknown(command, state):
+    logging.debug("Unknown command %s", command)
+
+
+def _svg_color_stop(command, state):
+    _, command_var, x, color = command
+    state.gradient_stops.append(f"<stop offset='{int(x * 100)}%' stop-color='{_escape_svg_attribute(color)}' />")
+
+
+_SVG_DISPATCH = {
+    "save": _svg_save,
+    "restore": _svg_restore,
+    "beginPath": _svg_begin_path,
+    "closePath": _svg_close_path,
+    "moveTo": _svg_move_to,
+    "lineTo": _svg_line_to,
+    "rect": _svg_rect,
+    "arc": None,  # arcs are not supported in svg output
+    "arcTo": None,
+    "cubicTo": _svg_cubic_to,
+    "quadraticTo": _svg_quadratic_to,
+    "clip": _svg_clip,
+    "translate": _svg_translate,
+    "scale": _svg_scale,
+    "rotate": _svg_rotate,
+    "image": _svg_image,
+    "data": _svg_data,
+    "stroke": _svg_stroke,
+    "fill": _svg_fill,
+    "fillText": _svg_fill_text,
+    "fillStyleGradient": _svg_fill_style_gradient,
+    "fillStyle": _svg_fill_style,
+    "font": _svg_font,
+    "textAlign": _svg_text_align,
+    "textBaseline": _svg_text_baseline,
+    "strokeStyle": _svg_stroke_style,
+    "lineWidth": _svg_line_width,
+    "lineDash": _svg_line_dash,
+    "lineCap": _svg_line_cap,
+    "lineJoin": _svg_line_join,
+    "gradient": _svg_gradient,
+    "colorStop": _svg_color_stop,
+    # commands which do not draw anything map to None and are skipped without a call.
+    "sleep": None,  # used for performance testing
+    "latency": None,
+    "message": None,
+    "timestamp": None,
+    "statistics": None,
+}
+
+
 class DrawingContext:
     """
         Path commands (begin_path, close_path, move_to, line_to, etc.) should not be intermixed
@@ -100,10 +745,14 @@ class DrawingContext:
     __image_id_lock = threading.RLock()
 
     def __init__(self):
+        # commands are plain tuples of (command_id, *args). they are handed unchanged to the native
+        # host via the proxy's convert_drawing_commands, so they must stay tuples and not objects.
         self.commands = []
         self.binary_commands = bytearray()
         self.save_count = 0
         self.images = dict()
+        self.__svg_cache = None
+        self.__encoded_images = dict()
 
     def copy_from(self, drawing_context):
         assert self.save_count == 0
@@ -111,6 +760,8 @@ class DrawingContext:
         self.commands = drawing_context.commands
         self.binary_commands = drawing_context.binary_commands
         self.images = drawing_context.images
+        self.__svg_cache = None
+        self.__encoded_images = dict()
 
     def add(self, drawing_context):
         self.commands.extend(drawing_context.commands)
@@ -122,351 +773,37 @@ class DrawingContext:
         self.binary_commands = []
         self.save_count = 0
         self.images = dict()
+        self.__svg_cache = None
+        self.__encoded_images = dict()
 
     def to_js(self):
-        js = ""
+        js_parts = list()
+        get_handler = _JS_DISPATCH.get
         for command in self.commands:
-            command_id = command[0]
-            command_args = command[1:]
-            if command_id == "save":
-                js += "ctx.save();"
-            elif command_id == "restore":
-                js += "ctx.restore();"
-            elif command_id == "beginPath":
-                js += "ctx.beginPath();"
-            elif command_id == "closePath":
-                js += "ctx.closePath();"
-            elif command_id == "clip":
-                js += "ctx.beginPath();"
-                js += "ctx.rect({0}, {1}, {2}, {3});".format(*command_args)
-                js += "ctx.clip();"
-            elif command_id == "translate":
-                js += "ctx.translate({0}, {1});".format(*command_args)
-            elif command_id == "scale":
-                js += "ctx.scale({0}, {1});".format(*command_args)
-            elif command_id == "rotate":
-                js += "ctx.rotate({0});".format(*command_args)
-            elif command_id == "moveTo":
-                js += "ctx.moveTo({0}, {1});".format(*command_args)
-            elif command_id == "lineTo":
-                js += "ctx.lineTo({0}, {1});".format(*command_args)
-            elif command_id == "rect":
-                js += "ctx.rect({0}, {1}, {2}, {3});".format(*command_args)
-            elif command_id == "arc":
-                x, y, r, sa, ea, ac = command_args
-                js += "ctx.arc({0}, {1}, {2}, {3}, {4}, {5});".format(x, y, r, sa, ea, "true" if ac else "false")
-            elif command_id == "arcTo":
-                x1, y1, x2, y2, r = command_args
-                js += "ctx.arcTo({0}, {1}, {2}, {3}, {4});".format(x1, y1, x2, y2, r)
-            elif command_id == "cubicTo":
-                x1, y1, x2, y2, x, y = command_args
-                js += "ctx.bezierCurveTo({0}, {1}, {2}, {3}, {4}, {5});".format(x1, y1, x2, y2, x, y)
-            elif command_id == "quadraticTo":
-                x1, y1, x, y = command_args
-                js += "ctx.quadraticCurveTo({0}, {1}, {2}, {3});".format(x1, y1, x, y)
-            elif command_id == "image":
-                w, h, image, image_id, a, b, c, d = command_args
-                js += "ctx.rect({0}, {1}, {2}, {3});".format(a, b, c, d)
-            elif command_id == "data":
-                w, h, data, data_id, a, b, c, d, low, high, color_table = command_args
-                js += "ctx.rect({0}, {1}, {2}, {3});".format(a, b, c, d)
-            elif command_id == "stroke":
-                js += "ctx.stroke();"
-            elif command_id == "sleep":
-                pass  # used for performance testing
-            elif command_id == "fill":
-                js += "ctx.fill();"
-            elif command_id == "fillText":
-                text, x, y, max_width = command_args
-                js += "ctx.fillText('{0}', {1}, {2}{3});".format(xml.sax.saxutils.escape(text), x, y, ", {0}".format(max_width) if max_width else "")
-            elif command_id == "fillStyleGradient":
-                command_var = command_args[0]
-                js += "ctx.fillStyle = {0};".format("grad" + str(command_var))
-            elif command_id == "fillStyle":
-                js += "ctx.fillStyle = '{0}';".format(*command_args)
-            elif command_id == "font":
-                js += "ctx.font = '{0}';".format(*command_args)
-            elif command_id == "textAlign":
-                js += "ctx.textAlign = '{0}';".format(*command_args)
-            elif command_id == "textBaseline":
-                js += "ctx.textBaseline = '{0}';".format(*command_args)
-            elif command_id == "strokeStyle":
-                js += "ctx.strokeStyle = '{0}';".format(*command_args)
-            elif command_id == "lineWidth":
-                js += "ctx.lineWidth = {0};".format(*command_args)
-            elif command_id == "lineDash":
-                js += "ctx.lineDash = {0};".format(*command_args)
-            elif command_id == "lineCap":
-                js += "ctx.lineCap = '{0}';".format(*command_args)
-            elif command_id == "lineJoin":
-                js += "ctx.lineJoin = '{0}';".format(*command_args)
-            elif command_id == "gradient":
-                command_var, width, height, x1, y1, x2, y2 = command_args  # pylint: disable=invalid-name
-                js_var = "grad" + str(command_var)
-                js += "var {0} = ctx.createLinearGradient({1}, {2}, {3}, {4});".format(js_var, x1, y1, x2 - x1, y2 - y1)
-            elif command_id == "colorStop":
-                command_var, x, color = command_args
-                js_var = "grad" + str(command_var)
-                js += "{0}.addColorStop({1}, '{2}');".format(js_var, x, color)
-        return js
+            handler = get_handler(command[0])
+            if handler is not None:
+                handler(command, js_parts)
+        return "".join(js_parts)
 
     def to_svg(self, size, viewbox):
-        svg = ""
-        defs = ""
-        path = ""
-        next_clip_id = 1
-        transform = list()
-        closers = list()
-        fill_style = None
-        fill_opacity = 1.0
-        stroke_style = None
-        stroke_opacity = 1.0
-        line_cap = "square"
-        line_join = "bevel"
-        line_width = 1.0
-        line_dash = None
-        text_anchor = "start"
-        text_baseline = "alphabetic"
-        font_style = None
-        font_weight = None
-        font_size = None
-        font_unit = None
-        font_family = None
-        contexts = collections.deque()
-        gradient_start = None
-        gradient_stops = list()
-
-        # make a SVG 1.1 compatible color, opacity tuple
-        def parse_color(color_str: str) -> typing.Tuple[str, float]:
-            color_str = ''.join(color_str.split())
-            if color_str.startswith("rgba"):
-                c = re.split("rgba\((\d+),(\d+),(\d+),([\d.]+)\)", color_str)
-                return f"rgb({c[1]}, {c[2]}, {c[3]})", float(c[4])
-            return color_str, 1.0
-
-        for command in self.commands:
-            command_id = command[0]
-            #logging.debug(command_id)
-            command_args = command[1:]
-            if command_id == "save":
-                context = dict()
-                context["path"] = path
-                context["transform"] = copy.deepcopy(transform)
-                context["fill_style"] = fill_style
-                context["fill_opacity"] = fill_opacity
-                context["stroke_style"] = stroke_style
-                context["stroke_opacity"] = stroke_opacity
-                context["line_cap"] = line_cap
-                context["line_join"] = line_join
-                context["line_width"] = line_width
-                context["line_dash"] = line_dash
-                context["font_style"] = font_style
-                context["font_weight"] = font_weight
-                context["font_size"] = font_size
-                context["font_unit"] = font_unit
-                context["font_family"] = font_family
-                context["text_anchor"] = text_anchor
-                context["text_baseline"] = text_baseline
-                context["closers"] = copy.deepcopy(closers)
-                closers = list()
-                contexts.append(context)
-            elif command_id == "restore":
-                svg += "".join(closers)
-                context = contexts.pop()
-                path = context["path"]
-                transform = context["transform"]
-                fill_style = context["fill_style"]
-                fill_opacity = context["fill_opacity"]
-                font_style = context["font_style"]
-                font_weight = context["font_weight"]
-                font_size = context["font_size"]
-                font_unit = context["font_unit"]
-                font_family = context["font_family"]
-                text_anchor = context["text_anchor"]
-                text_baseline = context["text_baseline"]
-                stroke_style = context["stroke_style"]
-                stroke_opacity = context["stroke_opacity"]
-                line_cap = context["line_cap"]
-                line_join = context["line_join"]
-                line_width = context["line_width"]
-                line_dash = context["line_dash"]
-                closers = context["closers"]
-            elif command_id == "beginPath":
-                path = ""
-            elif command_id == "closePath":
-                path += " Z"
-            elif command_id == "moveTo":
-                path += " M {0} {1}".format(*command_args)
-            elif command_id == "lineTo":
-                path += " L {0} {1}".format(*command_args)
-            elif command_id == "rect":
-                x, y, w, h = command_args
-                path += " M {0} {1}".format(x, y)
-                path += " L {0} {1}".format(x + w, y)
-                path += " L {0} {1}".format(x + w, y + h)
-                path += " L {0} {1}".format(x, y + h)
-                path += " Z"
-            elif command_id == "arc":
-                x, y, r, sa, ea, ac = command_args
-                # js += "ctx.arc({0}, {1}, {2}, {3}, {4}, {5});".format(x, y, r, sa, ea, "true" if ac else "false")
-            elif command_id == "arcTo":
-                x1, y1, x2, y2, r = command_args
-                # js += "ctx.arcTo({0}, {1}, {2}, {3}, {4});".format(x1, y1, x2, y2, r)
-            elif command_id == "cubicTo":
-                path += " C {0} {1}, {2} {3}, {4} {5}".format(*command_args)
-            elif command_id == "quadraticTo":
-                path += " Q {0} {1}, {2} {3}".format(*command_args)
-            elif command_id == "clip":
-                x, y, w, h = command_args
-                clip_id = "clip" + str(next_clip_id)
-                next_clip_id += 1
-                transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                defs_format_str = "<clipPath id='{0}'><rect x='{1}' y='{2}' width='{3}' height='{4}'{5} /></clipPath>"
-                defs += defs_format_str.format(clip_id, x, y, w, h, transform_str)
-                svg += "<g style='clip-path: url(#{0});'>".format(clip_id)
-                closers.append("</g>")
-            elif command_id == "translate":
-                transform.append("translate({0},{1})".format(*command_args))
-            elif command_id == "scale":
-                transform.append("scale({0},{1})".format(*command_args))
-            elif command_id == "rotate":
-                transform.append("rotate({0})".format(*command_args))
-            elif command_id == "image":
-                w, h, image, image_id, a, b, c, d = command_args
-                png_file = io.BytesIO()
-                rgba_data = get_rgba_view_from_rgba_data(image)
-                imageio.imwrite(png_file, rgba_data[..., (2,1,0,3)], "png")
-                png_encoded = base64.b64encode(png_file.getvalue()).decode('utf=8')
-                transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                svg_format_str = "<image x='{0}' y='{1}' width='{2}' height='{3}' xlink:href='data:image/png;base64,{4}'{5} />"
-                svg += svg_format_str.format(a, b, c, d, png_encoded, transform_str)
-            elif command_id == "data":
-                w, h, data, data_id, a, b, c, d, low, high, color_table, color_table_image_id = command_args
-                m = 255.0 / (high - low) if high != low else 1
-                image = numpy.empty(data.shape, numpy.uint32)
-                if color_table is not None:
-                    adj_color_table = numpy.empty(color_table.shape, numpy.uint32)
-                    # ordering of color_table is BGRA
-                    # ordering of adj_color_table is RGBA
-                    get_byte_view(adj_color_table)[:, 0] = get_byte_view(color_table)[:, 2]
-                    get_byte_view(adj_color_table)[:, 1] = get_byte_view(color_table)[:, 1]
-                    get_byte_view(adj_color_table)[:, 2] = get_byte_view(color_table)[:, 0]
-                    get_byte_view(adj_color_table)[:, 3] = get_byte_view(color_table)[:, 3]
-                    clipped_array = numpy.clip((m * (data - low)).astype(numpy.int), 0, 255).astype(numpy.uint8)
-                    image[:] = adj_color_table[clipped_array]
-                else:
-                    clipped_array = numpy.clip(data, low, high)
-                    numpy.subtract(clipped_array, low, out=clipped_array)
-                    numpy.multiply(clipped_array, m, out=clipped_array)
-                    get_red_view(image)[:] = clipped_array
-                    get_green_view(image)[:] = clipped_array
-                    get_blue_view(image)[:] = clipped_array
-                    get_alpha_view(image)[:] = 255
-                png_file = io.BytesIO()
-                imageio.imwrite(png_file, get_rgba_view_from_rgba_data(image), "png")
-                png_encoded = base64.b64encode(png_file.getvalue()).decode('utf=8')
-                transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                svg_format_str = "<image x='{0}' y='{1}' width='{2}' height='{3}' xlink:href='data:image/png;base64,{4}'{5} />"
-                svg += svg_format_str.format(a, b, c, d, png_encoded, transform_str)
-            elif command_id == "stroke":
-                if stroke_style is not None:
-                    transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                    dash_str = " stroke-dasharray='{0}, {1}'".format(line_dash, line_dash) if line_dash else ""
-                    svg += f"<path d='{path}' fill='none' stroke='{stroke_style}' stroke-opacity='{stroke_opacity}' stroke-width='{line_width}' stroke-linejoin='{line_join}' stroke-linecap='{line_cap}'{dash_str}{transform_str} />"
-            elif command_id == "sleep":
-                pass  # used for performance testing
-            elif command_id == "fill":
-                if fill_style is not None:
-                    transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                    svg += f"<path d='{path}' fill='{fill_style}' fill-opacity='{fill_opacity}' stroke='none'{transform_str} />"
-            elif command_id == "fillText":
-                text, x, y, max_width = command_args
-                transform_str = " transform='{0}'".format(" ".join(transform)) if len(transform) > 0 else ""
-                font_str = ""
-                if font_style:
-                    font_str += " font-style='{0}'".format(font_style)
-                if font_weight:
-                    font_str += " font-weight='{0}'".format(font_weight)
-                if font_size:
-                    font_str += " font-size='{0}{1}'".format(font_size, font_unit)
-                if font_family:
-                    font_str += " font-family='{0}'".format(font_family)
-                if fill_style:
-                    font_str += " fill='{0}'".format(fill_style)
-                if fill_opacity < 1.0:
-                    font_str += " fill-opacity='{0}'".format(fill_opacity)
-                svg_format_str = "<text x='{0}' y='{1}' text-anchor='{3}' alignment-baseline='{4}'{5}{6}>{2}</text>"
-                svg += svg_format_str.format(x, y, xml.sax.saxutils.escape(text), text_anchor, text_baseline, font_str,
-                                             transform_str)
-            elif command_id == "fillStyleGradient":
-                command_var = command_args[0]
-                defs += gradient_start + "".join(gradient_stops) + "</linearGradient>"
-                fill_style = "url(#{0})".format("grad" + str(command_var))
-            elif command_id == "fillStyle":
-                fill_style, fill_opacity = parse_color(command_args[0])
-            elif command_id == "font":
-                font_style = None
-                font_weight = None
-                font_size = None
-                font_unit = None
-                font_family = None
-                for font_part in [s for s in command_args[0].split(" ") if s]:
-                    if font_part == "italic":
-                        font_style = "italic"
-                    elif font_part == "bold":
-                        font_weight = "bold"
-                    elif font_part.endswith("px") and int(font_part[0:-2]) > 0:
-                        font_size = int(font_part[0:-2])
-                        font_unit = "px"
-                    elif font_part.endswith("pt") and int(font_part[0:-2]) > 0:
-                        font_size = int(font_part[0:-2])
-                        font_unit = "pt"
-                    else:
-                        font_family = font_part
-            elif command_id == "textAlign":
-                text_anchors = {"start": "start", "end": "end", "left": "start", "center": "middle", "right": "end"}
-                text_anchor = text_anchors.get(command_args[0], "start")
-            elif command_id == "textBaseline":
-                text_baselines = {"top": "hanging", "hanging": "hanging", "middle": "middle",
-                                  "alphabetic": "alphabetic", "ideaographic": "ideaographic", "bottom": "bottom"}
-                text_baseline = text_baselines.get(command_args[0], "alphabetic")
-            elif command_id == "strokeStyle":
-                stroke_style, stroke_opacity = parse_color(command_args[0])
-            elif command_id == "lineWidth":
-                line_width = command_args[0]
-            elif command_id == "lineDash":
-                line_dash = command_args[0]
-            elif command_id == "lineCap":
-                line_caps = {"square": "square", "round": "round", "butt": "butt"}
-                line_cap = line_caps.get(command_args[0], "square")
-            elif command_id == "lineJoin":
-                line_joins = {"round": "round", "miter": "miter", "bevel": "bevel"}
-                line_join = line_joins.get(command_args[0], "bevel")
-            elif command_id == "gradient":
-                # assumes that gradient will be used immediately after being
-                # declared and stops being defined. this is currently enforced by
-                # the way the commands are generated in drawing context.
-                command_var, w, h, x1, y1, x2, y2 = command_args
-                grad_id = "grad" + str(command_var)
-                gradient_start = "<linearGradient id='{0}' x1='{1}' y1='{2}' x2='{3}' y2='{4}'>".format(grad_id,
-                                                                                                        float(x1 / w),
-                                                                                                        float(y1 / h),
-                                                                                                        float(x2 / w),
-                                                                                                        float(y2 / h))
-            elif command_id == "colorStop":
-                command_var, x, color = command_args
-                gradient_stops.append("<stop offset='{0}%' stop-color='{1}' />".format(int(x * 100), color))
-            else:
-                logging.debug("Unknown command %s", command)
+        # commands are only ever appended, so the identity and length of the command list identify its contents.
+        commands = self.commands
+        cache_key = (len(commands), size.width, size.height, viewbox.left, viewbox.top, viewbox.width, viewbox.height)
+        svg_cache = self.__svg_cache
+        if svg_cache is not None and svg_cache[0] is commands and svg_cache[1] == cache_key:
+            return svg_cache[2]
+        _encode_pngs(commands, self.__encoded_images)
+        state = _SVGState(self.__encoded_images)
+        get_handler = _SVG_DISPATCH.get
+        for command in commands:
+            handler = get_handler(command[0], _svg_unknown)
+            if handler is not None:
+                handler(command, state)
         xmlns = "xmlns='http://www.w3.org/2000/svg' xmlns:xlink='http://www.w3.org/1999/xlink'"
-        viewbox_str = "{0} {1} {2} {3}".format(viewbox.left, viewbox.top, viewbox.width, viewbox.height)
-        result = "<svg version='1.1' baseProfile='full' width='{0}' height='{1}' viewBox='{2}' {3}>".format(size.width,
-                                                                                                            size.height,
-                                                                                                            viewbox_str,
-                                                                                                            xmlns)
-        result += "<defs>" + defs + "</defs>"
-        result += svg
-        result += "</svg>"
+        viewbox_str = f"{viewbox.left} {viewbox.top} {viewbox.width} {viewbox.height}"
+        result = f"<svg version='1.1' baseProfile='full' width='{size.width}' height='{size.height}' viewBox='{viewbox_str}' {xmlns}>"
+        result = "".join([result, "<defs>", "".join(state.defs_parts), "</defs>", "".join(state.svg_parts), "</svg>"])
+        self.__svg_cache = (commands, cache_key, result)
         return result
 
     @contextmanager
@@ -496,32 +833,39 @@ class DrawingContext:
         self.binary_commands.extend(b"cpth")
 
     def clip_rect(self, a, b, c, d):
-        self.commands.append(("clip", float(a), float(b), float(c), float(d)))
-        self.binary_commands.extend(struct.pack("4sffff", b"clip", float(a), float(b), float(c), float(d)))
+        a, b, c, d = float(a), float(b), float(c), float(d)
+        self.commands.append(("clip", a, b, c, d))
+        self.binary_commands.extend(struct.pack("4sffff", b"clip", a, b, c, d))
 
     def translate(self, x, y):
-        self.commands.append(("translate", float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sff", b"tran", float(x), float(y)))
+        x, y = float(x), float(y)
+        self.commands.append(("translate", x, y))
+        self.binary_commands.extend(struct.pack("4sff", b"tran", x, y))
 
     def scale(self, x, y):
-        self.commands.append(("scale", float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sff", b"scal", float(x), float(y)))
+        x, y = float(x), float(y)
+        self.commands.append(("scale", x, y))
+        self.binary_commands.extend(struct.pack("4sff", b"scal", x, y))
 
     def rotate(self, radians):
-        self.commands.append(("rotate", math.degrees(float(radians))))
-        self.binary_commands.extend(struct.pack("4sf", b"rota", math.degrees(float(radians))))
+        degrees = float(radians) * _DEGREES_PER_RADIAN
+        self.commands.append(("rotate", degrees))
+        self.binary_commands.extend(struct.pack("4sf", b"rota", degrees))
 
     def move_to(self, x, y):
-        self.commands.append(("moveTo", float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sff", b"move", float(x), float(y)))
+        x, y = float(x), float(y)
+        self.commands.append(("moveTo", x, y))
+        self.binary_commands.extend(struct.pack("4sff", b"move", x, y))
 
     def line_to(self, x, y):
-        self.commands.append(("lineTo", float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sff", b"line", float(x), float(y)))
+        x, y = float(x), float(y)
+        self.commands.append(("lineTo", x, y))
+        self.binary_commands.extend(struct.pack("4sff", b"line", x, y))
 
     def rect(self, l, t, w, h):
-        self.commands.append(("rect", float(l), float(t), float(w), float(h)))
-        self.binary_commands.extend(struct.pack("4sffff", b"rect", float(l), float(t), float(w), float(h)))
+        l, t, w, h = float(l), float(t), float(w), float(h)
+        self.commands.append(("rect", l, t, w, h))
+        self.binary_commands.extend(struct.pack("4sffff", b"rect", l, t, w, h))
 
     def round_rect(self, x, y, w, h, r):
         self.move_to(x + r, y)
@@ -532,20 +876,24 @@ class DrawingContext:
         self.close_path()
 
     def arc(self, x, y, r, sa, ea, ac=False):
-        self.commands.append(("arc", float(x), float(y), float(r), float(sa), float(ea), bool(ac)))
-        self.binary_commands.extend(struct.pack("4sfffffi", b"arc ", float(x), float(y), float(r), float(sa), float(ea), bool(ac)))
+        x, y, r, sa, ea, ac = float(x), float(y), float(r), float(sa), float(ea), bool(ac)
+        self.commands.append(("arc", x, y, r, sa, ea, ac))
+        self.binary_commands.extend(struct.pack("4sfffffi", b"arc ", x, y, r, sa, ea, ac))
 
     def arc_to(self, x1, y1, x2, y2, r):
-        self.commands.append(("arcTo", float(x1), float(y1), float(x2), float(y2), float(r)))
-        self.binary_commands.extend(struct.pack("4sfffff", b"arct", float(x1), float(y1), float(x2), float(y2), float(r)))
+        x1, y1, x2, y2, r = float(x1), float(y1), float(x2), float(y2), float(r)
+        self.commands.append(("arcTo", x1, y1, x2, y2, r))
+        self.binary_commands.extend(struct.pack("4sfffff", b"arct", x1, y1, x2, y2, r))
 
     def bezier_curve_to(self, x1, y1, x2, y2, x, y):
-        self.commands.append(("cubicTo", float(x1), float(y1), float(x2), float(y2), float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sffffff", b"cubc", float(x1), float(y1), float(x2), float(y2), float(x), float(y)))
+        x1, y1, x2, y2, x, y = float(x1), float(y1), float(x2), float(y2), float(x), float(y)
+        self.commands.append(("cubicTo", x1, y1, x2, y2, x, y))
+        self.binary_commands.extend(struct.pack("4sffffff", b"cubc", x1, y1, x2, y2, x, y))
 
     def quadratic_curve_to(self, x1, y1, x, y):
-        self.commands.append(("quadraticTo", float(x1), float(y1), float(x), float(y)))
-        self.binary_commands.extend(struct.pack("4sffff", b"quad", float(x1), float(y1), float(x), float(y)))
+        x1, y1, x, y = float(x1), float(y1), float(x), float(y)
+        self.commands.append(("quadraticTo", x1, y1, x, y))
+        self.binary_commands.extend(struct.pack("4sffff", b"quad", x1, y1, x, y))
 
     def draw_image(self, img, x, y, width, height):
         # img should be rgba pack, uint32
@@ -604,9 +952,10 @@ class DrawingContext:
 
     def fill_text(self, text, x, y, max_width=None):
         text = str(text) if text is not None else str()
-        self.commands.append(("fillText", text, float(x), float(y), float(max_width) if max_width else 0))
+        x, y, max_width = float(x), float(y), float(max_width) if max_width else 0
+        self.commands.append(("fillText", text, x, y, max_width))
         text_encoded = text.encode("utf-8")
-        self.binary_commands.extend(struct.pack("4si{}sfff".format(len(text_encoded)), b"text", len(text_encoded), text_encoded, float(x), float(y), float(max_width) if max_width else 0))
+        self.binary_commands.extend(struct.pack("4si{}sfff".format(len(text_encoded)), b"text", len(text_encoded), text_encoded, x, y, max_width))
 
     @property
     def fill_style(self):
@@ -689,8 +1038,9 @@ class DrawingContext:
         raise NotImplementedError()
 
     def __set_line_width(self, a):
-        self.commands.append(("lineWidth", float(a)))
-        self.binary_commands.extend(struct.pack("4sf", b"linw", float(a)))
+        a = float(a)
+        self.commands.append(("lineWidth", a))
+        self.binary_commands.extend(struct.pack("4sf", b"linw", a))
 
     line_width = property(__get_line_width, __set_line_width)
 
@@ -699,8 +1049,9 @@ class DrawingContext:
 
     def __set_line_dash(self, a):
         """ Set the line dash. Takes a single value with the length of the dash. """
-        self.commands.append(("lineDash", float(a)))
-        self.binary_commands.extend(struct.pack("4sf", b"ldsh", float(a)))
+        a = float(a)
+        self.commands.append(("lineDash", a))
+        self.binary_commands.extend(struct.pack("4sf", b"ldsh", a))
 
     line_dash = property(__get_line_dash, __set_line_dash)
 
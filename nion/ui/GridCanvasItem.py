@@ -7,6 +7,7 @@
 """
 # standard libraries
 import enum
+import typing
 
 # third party libraries
 # none
@@ -22,6 +23,21 @@ class Direction(enum.Enum):
     Column = 1
 
 
+def _index_strides(direction: Direction, items_per_row: int, items_per_column: int) -> typing.Tuple[int, int]:
+    """Return the change in item index for a step of one row and one column."""
+    if direction == Direction.Row:
+        return items_per_row, 1
+    return 1, items_per_column
+
+
+def _cell_for_index(index: int, direction: Direction, items_per_row: int, items_per_column: int) -> typing.Tuple[int, int]:
+    """Return the row and column of the cell for the item index."""
+    if direction == Direction.Row:
+        return divmod(index, items_per_row)
+    column, row = divmod(index, items_per_column)
+    return row, column
+
+
 class GridCanvasItem(CanvasItem.AbstractCanvasItem):
     """
     Takes a delegate that supports the following properties, methods, and optional methods:
@@ -56,6 +72,7 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
         self.__mouse_dragging = False
         self.__direction = direction
         self.__wrap = wrap
+        self.__layout_cache = None
 
     def close(self):
         self.__selection_changed_listener.close()
@@ -64,6 +81,7 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
 
     def detach_delegate(self):
         self.__delegate = None
+        self.__layout_cache = None
 
     @property
     def direction(self) -> Direction:
@@ -84,25 +102,11 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
         self.__wrap = value
         self.refresh_layout()
 
-    def __calculate_layout_size(self, canvas_size: Geometry.IntSize) -> Geometry.IntSize:
-        # update the layout based on the current canvas size
-        canvas_size = Geometry.IntSize.make(canvas_size)
-
-        item_size = self.__calculate_item_size(canvas_size)
+    def __calculate_layout_size(self, canvas_size) -> typing.Tuple[int, int]:
+        # update the layout based on the current canvas size. canvas_size is anything indexable as (height, width); the
+        # result is a (height, width) tuple which the canvas item turns into its IntSize.
         item_count = self.__delegate.item_count if self.__delegate else 0
-
-        if self.direction == Direction.Row:
-            items_per_row = max(1, int(canvas_size.width / item_size.width) if self.wrap else item_count)
-            item_rows = max((item_count + items_per_row - 1) // items_per_row, 1)
-            width = canvas_size.width if self.wrap else item_count * item_size.width
-            canvas_size = Geometry.IntSize(height=item_rows * item_size.height, width=width)
-        else:
-            items_per_column = max(1, int(canvas_size.height / item_size.height) if self.wrap else item_count)
-            item_columns = max((item_count + items_per_column - 1) // items_per_column, 1)
-            height = canvas_size.height if self.wrap else item_count * item_size.height
-            canvas_size = Geometry.IntSize(height=height, width=item_columns * item_size.width)
-
-        return canvas_size
+        return self.__get_layout_entry(canvas_size[1], canvas_size[0], item_count)[1]
 
     def update_layout(self, canvas_origin, canvas_size, *, immediate=False):
         """Override from abstract canvas item.
@@ -119,99 +123,139 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
         self.update()
         return True
 
-    def __calculate_item_size(self, canvas_size: Geometry.IntSize) -> Geometry.IntSize:
+    def __calculate_item_size(self, canvas_width: int, canvas_height: int) -> typing.Tuple[int, int]:
+        # returns the item width and height.
         if self.wrap:
             target_size = 80
-            item_width = max(60, int(canvas_size.width / max(1, ((canvas_size.width + target_size // 4) // target_size))))
-            return Geometry.IntSize(item_width, item_width)
+            item_width = max(60, canvas_width // max(1, ((canvas_width + target_size // 4) // target_size)))
+            return item_width, item_width
         else:
             if self.direction == Direction.Row:
-                return Geometry.IntSize(canvas_size.height, canvas_size.height)
+                return canvas_height, canvas_height
             else:
-                return Geometry.IntSize(canvas_size.width, canvas_size.width)
+                return canvas_width, canvas_width
+
+    def __get_layout(self, canvas_width: int, canvas_height: int, item_count: int) -> typing.Tuple[int, int, int, int]:
+        """Return the item width, item height, items per row, and items per column for the canvas size."""
+        return self.__get_layout_entry(canvas_width, canvas_height, item_count)[0]
+
+    def __get_layout_entry(self, canvas_width: int, canvas_height: int, item_count: int) -> typing.Tuple[typing.Tuple[int, int, int, int], typing.Tuple[int, int]]:
+        """Return the item layout and the (height, width) layout size for the canvas size.
+
+        The result is cached since it is needed for every layout, paint, hit test, and key press but only changes with
+        the canvas size, the layout options, or the item count.
+        """
+        layout_key = (canvas_width, canvas_height, self.__direction, self.__wrap, item_count)
+        layout_cache = self.__layout_cache
+        if layout_cache is not None and layout_cache[0] == layout_key:
+            return layout_cache[1]
+        item_width, item_height = self.__calculate_item_size(canvas_width, canvas_height)
+        items_per_row = max(1, canvas_width // item_width if self.wrap else item_count)
+        items_per_column = max(1, canvas_height // item_height if self.wrap else item_count)
+        if self.direction == Direction.Row:
+            item_rows = max((item_count + items_per_row - 1) // items_per_row, 1)
+            width = canvas_width if self.wrap else item_count * item_width
+            layout_size = (item_rows * item_height, width)
+        else:
+            item_columns = max((item_count + items_per_column - 1) // items_per_column, 1)
+            height = canvas_height if self.wrap else item_count * item_height
+            layout_size = (height, item_columns * item_width)
+        layout_entry = ((item_width, item_height, items_per_row, items_per_column), layout_size)
+        self.__layout_cache = (layout_key, layout_entry)
+        return layout_entry
 
     def __rect_for_index(self, index: int) -> Geometry.IntRect:
         canvas_size = self.canvas_size
-        item_size = self.__calculate_item_size(canvas_size)
         item_count = self.__delegate.item_count if self.__delegate else 0
-        items_per_row = max(1, int(canvas_size.width / item_size.width) if self.wrap else item_count)
-        items_per_column = max(1, int(canvas_size.height / item_size.height) if self.wrap else item_count)
-        if self.direction == Direction.Row:
-            row = index // items_per_row
-            column = index - row * items_per_row
-        else:
-            column = index // items_per_column
-            row = index - column * items_per_column
-        return Geometry.IntRect(origin=Geometry.IntPoint(y=row * item_size.height, x=column * item_size.width), size=Geometry.IntSize(width=item_size.width, height=item_size.height))
+        item_width, item_height, items_per_row, items_per_column = self.__get_layout(canvas_size.width, canvas_size.height, item_count)
+        row, column = _cell_for_index(index, self.direction, items_per_row, items_per_column)
+        return Geometry.IntRect((row * item_height, column * item_width), (item_height, item_width))
 
     def _repaint_visible(self, drawing_context, visible_rect):
+        delegate = self.__delegate
+        selection = self.__selection
         canvas_size = self.canvas_size
-        if self.__delegate and canvas_size.height > 0 and canvas_size.width > 0:
-            item_size = self.__calculate_item_size(canvas_size)
-            items = self.__delegate.items if self.__delegate else list()
+        if delegate and canvas_size.height > 0 and canvas_size.width > 0:
+            items = delegate.items
             item_count = len(items)
-            items_per_row = max(1, int(canvas_size.width / item_size.width) if self.wrap else item_count)
-            items_per_column = max(1, int(canvas_size.height / item_size.height) if self.wrap else item_count)
+            item_width, item_height, items_per_row, items_per_column = self.__get_layout(canvas_size.width, canvas_size.height, item_count)
+            selection_fill_style = "#3875D6" if self.focused else "#BBB"
+
+            if self.direction == Direction.Row:
+                row_count = (item_count + items_per_row - 1) // items_per_row
+                column_count = items_per_row
+            else:
+                row_count = items_per_column
+                column_count = (item_count + items_per_column - 1) // items_per_column
 
             with drawing_context.saver():
-                top_visible_row = visible_rect.top // item_size.height
-                bottom_visible_row = visible_rect.bottom // item_size.height
-                left_visible_column = visible_rect.left // item_size.width
-                right_visible_column = visible_rect.right // item_size.width
+                # clamp the visible cells to the grid so that every cell visited intersects the visible rect.
+                top_visible_row = max(0, visible_rect.top // item_height)
+                bottom_visible_row = min(row_count - 1, (visible_rect.bottom - 1) // item_height)
+                left_visible_column = max(0, visible_rect.left // item_width)
+                right_visible_column = min(column_count - 1, (visible_rect.right - 1) // item_width)
+                # the cell coordinates are shared by every row and column, so compute them once per repaint.
+                visible_columns = range(left_visible_column, right_visible_column + 1)
+                column_lefts = [column * item_width for column in visible_columns]
+                item_size = (item_height, item_width)
+                row_stride, column_stride = _index_strides(self.direction, items_per_row, items_per_column)
+                column_indexes = [column * column_stride for column in visible_columns]
+                # take a copy of the selected indexes once rather than querying the selection for every cell.
+                selected_indexes = selection.indexes
+                visible_cells = list()
                 for row in range(top_visible_row, bottom_visible_row + 1):
-                    for column in range(left_visible_column, right_visible_column + 1):
-                        if self.direction == Direction.Row:
-                            index = row * items_per_row + column
-                        else:
-                            index = row + column * items_per_column
-                        if 0 <= index < item_count:
-                            rect = Geometry.IntRect(origin=Geometry.IntPoint(y=row * item_size.height, x=column * item_size.width),
-                                                    size=Geometry.IntSize(width=item_size.width, height=item_size.height))
-                            if rect.intersects_rect(visible_rect):
-                                is_selected = self.__selection.contains(index)
-                                if is_selected:
-                                    with drawing_context.saver():
-                                        drawing_context.begin_path()
-                                        drawing_context.rect(rect.left, rect.top, rect.width, rect.height)
-                                        drawing_context.fill_style = "#3875D6" if self.focused else "#BBB"
-                                        drawing_context.fill()
-                                self.__delegate.paint_item(drawing_context, items[index], rect, is_selected)
+                    row_top = row * item_height
+                    row_index = row * row_stride
+                    for column_index, column_left in zip(column_indexes, column_lefts):
+                        index = row_index + column_index
+                        if index < item_count:
+                            visible_cells.append((index, column_left, row_top, index in selected_indexes))
+                # cells do not overlap, so the highlights of all selected cells can be filled as one path before
+                # any of the items are painted.
+                selected_cells = [visible_cell for visible_cell in visible_cells if visible_cell[3]]
+                if selected_cells:
+                    with drawing_context.saver():
+                        drawing_context.begin_path()
+                        for index, column_left, row_top, is_selected in selected_cells:
+                            drawing_context.rect(column_left, row_top, item_width, item_height)
+                        drawing_context.fill_style = selection_fill_style
+                        drawing_context.fill()
+                for index, column_left, row_top, is_selected in visible_cells:
+                    # the delegate expects an IntRect; build it from plain tuples.
+                    rect = Geometry.IntRect((row_top, column_left), item_size)
+                    delegate.paint_item(drawing_context, items[index], rect, is_selected)
 
     def _repaint(self, drawing_context):
         self._repaint_visible(drawing_context, self.canvas_bounds)
 
     def context_menu_event(self, x, y, gx, gy):
-        if self.__delegate:
+        delegate = self.__delegate
+        selection = self.__selection
+        if delegate:
             mouse_index = self.__get_item_index_at(x, y)
-            max_index = self.__delegate.item_count
+            max_index = delegate.item_count
             if mouse_index >= 0 and mouse_index < max_index:
-                if not self.__selection.contains(mouse_index):
-                    self.__selection.set(mouse_index)
-                if self.__delegate.on_context_menu_event:
-                    return self.__delegate.on_context_menu_event(mouse_index, x, y, gx, gy)
+                if not selection.contains(mouse_index):
+                    selection.set(mouse_index)
+                if delegate.on_context_menu_event:
+                    return delegate.on_context_menu_event(mouse_index, x, y, gx, gy)
             else:
-                if self.__delegate.on_context_menu_event:
-                    return self.__delegate.on_context_menu_event(None, x, y, gx, gy)
+                if delegate.on_context_menu_event:
+                    return delegate.on_context_menu_event(None, x, y, gx, gy)
         return False
 
     def __get_item_index_at(self, x, y):
         canvas_size = self.canvas_size
-        item_size = self.__calculate_item_size(canvas_size)
         item_count = self.__delegate.item_count if self.__delegate else 0
-        items_per_row = max(1, int(canvas_size.width / item_size.width) if self.wrap else item_count)
-        items_per_column = max(1, int(canvas_size.height / item_size.height) if self.wrap else item_count)
-        mouse_row = y // item_size.height
-        mouse_column = x // item_size.width
-        if self.direction == Direction.Row:
-            mouse_index = mouse_row * items_per_row + mouse_column
-        else:
-            mouse_index = mouse_row + items_per_column * mouse_column
-        return mouse_index
+        item_width, item_height, items_per_row, items_per_column = self.__get_layout(canvas_size.width, canvas_size.height, item_count)
+        row_stride, column_stride = _index_strides(self.direction, items_per_row, items_per_column)
+        return (y // item_height) * row_stride + (x // item_width) * column_stride
 
     def mouse_pressed(self, x, y, modifiers):
-        if self.__delegate:
+        delegate = self.__delegate
+        if delegate:
             mouse_index = self.__get_item_index_at(x, y)
-            max_index = self.__delegate.item_count
+            max_index = delegate.item_count
             if mouse_index >= 0 and mouse_index < max_index:
                 self.__mouse_index = mouse_index
                 self.__mouse_pressed = True
@@ -222,18 +266,20 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
             return super().mouse_pressed(x, y, modifiers)
 
     def __mouse_released(self, x, y, modifiers, do_select):
-        if self.__delegate and self.__mouse_pressed and do_select:
+        delegate = self.__delegate
+        selection = self.__selection
+        if delegate and self.__mouse_pressed and do_select:
             # double check whether mouse_released has been called explicitly as part of a drag.
             # see https://bugreports.qt.io/browse/QTBUG-40733
             mouse_index = self.__mouse_index
-            max_index = self.__delegate.item_count
+            max_index = delegate.item_count
             if mouse_index is not None and mouse_index >= 0 and mouse_index < max_index:
                 if modifiers.shift:
-                    self.__selection.extend(mouse_index)
+                    selection.extend(mouse_index)
                 elif modifiers.control:
-                    self.__selection.toggle(mouse_index)
+                    selection.toggle(mouse_index)
                 else:
-                    self.__selection.set(mouse_index)
+                    selection.set(mouse_index)
         self.__mouse_pressed = False
         self.__mouse_pressed_for_dragging = False
         self.__mouse_index = None
@@ -246,7 +292,11 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
 
     def mouse_position_changed(self, x, y, modifiers):
         if self.__mouse_pressed_for_dragging:
-            if not self.__mouse_dragging and Geometry.distance(self.__mouse_position, Geometry.IntPoint(y=y, x=x)) > 8:
+            mouse_position = self.__mouse_position
+            dx = x - mouse_position.x
+            dy = y - mouse_position.y
+            # compare the squared distance against the squared drag threshold of 8 to avoid the square root.
+            if not self.__mouse_dragging and dx * dx + dy * dy > 64:
                 self.__mouse_dragging = True
                 if self.__delegate and self.__delegate.on_drag_started:
                     root_container = self.root_container
@@ -267,128 +317,98 @@ class GridCanvasItem(CanvasItem.AbstractCanvasItem):
                     return True
         return super().mouse_double_clicked(x, y, modifiers)
 
+    def __get_selection_bounds(self) -> typing.Optional[typing.Tuple[int, int]]:
+        """Return the lowest and highest selected index, or None if nothing is selected."""
+        # the common single selection needs neither a copy of the indexes nor a scan over them.
+        current_index = self.__selection.current_index
+        if current_index is not None:
+            return current_index, current_index
+        indexes = self.__selection.indexes
+        if len(indexes) > 0:
+            return min(indexes), max(indexes)
+        return None
+
     def __make_selection_visible(self, top):
         if self.__delegate:
-            selected_indexes = list(self.__selection.indexes)
-            if len(selected_indexes) > 0 and self.canvas_bounds is not None:
-                min_index = min(selected_indexes)
-                max_index = max(selected_indexes)
-                min_rect = self.__rect_for_index(min_index)
-                max_rect = self.__rect_for_index(max_index)
+            selection_bounds = self.__get_selection_bounds()
+            if selection_bounds is not None and self.canvas_bounds is not None:
+                # moving toward the start shows the first selected item, moving toward the end shows the last.
+                rect = self.__rect_for_index(selection_bounds[0] if top else selection_bounds[1])
                 visible_rect = self.container.visible_rect
                 if (self.direction == Direction.Row and self.wrap) or (self.direction == Direction.Column and not self.wrap):
                     if top:
-                        if min_rect.top < visible_rect.top:
-                            self.update_layout(Geometry.IntPoint(y=-min_rect.top, x=self.canvas_origin.x), self.canvas_size)
-                        elif min_rect.bottom > visible_rect.bottom:
-                            self.update_layout(Geometry.IntPoint(y=-min_rect.bottom + visible_rect.height, x=self.canvas_origin.x), self.canvas_size)
+                        if rect.top < visible_rect.top:
+                            self.update_layout(Geometry.IntPoint(y=-rect.top, x=self.canvas_origin.x), self.canvas_size)
+                        elif rect.bottom > visible_rect.bottom:
+                            self.update_layout(Geometry.IntPoint(y=-rect.bottom + visible_rect.height, x=self.canvas_origin.x), self.canvas_size)
                     else:
-                        if max_rect.bottom > visible_rect.bottom:
-                            self.update_layout(Geometry.IntPoint(y=-max_rect.bottom + visible_rect.height, x=self.canvas_origin.x), self.canvas_size)
-                        elif max_rect.top < visible_rect.top:
-                            self.update_layout(Geometry.IntPoint(y=-max_rect.top, x=self.canvas_origin.x), self.canvas_size)
+                        if rect.bottom > visible_rect.bottom:
+                            self.update_layout(Geometry.IntPoint(y=-rect.bottom + visible_rect.height, x=self.canvas_origin.x), self.canvas_size)
+                        elif rect.top < visible_rect.top:
+                            self.update_layout(Geometry.IntPoint(y=-rect.top, x=self.canvas_origin.x), self.canvas_size)
                 else:
                     if top:
-                        if min_rect.left < visible_rect.left:
-                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-min_rect.left), self.canvas_size)
-                        elif min_rect.right > visible_rect.right:
-                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-min_rect.right + visible_rect.width), self.canvas_size)
+                        if rect.left < visible_rect.left:
+                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-rect.left), self.canvas_size)
+                        elif rect.right > visible_rect.right:
+                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-rect.right + visible_rect.width), self.canvas_size)
                     else:
-                        if max_rect.right > visible_rect.right:
-                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-max_rect.right + visible_rect.width), self.canvas_size)
-                        elif max_rect.left < visible_rect.left:
-                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-max_rect.left), self.canvas_size)
+                        if rect.right > visible_rect.right:
+                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-rect.right + visible_rect.width), self.canvas_size)
+                        elif rect.left < visible_rect.left:
+                            self.update_layout(Geometry.IntPoint(y=self.canvas_origin.y, x=-rect.left), self.canvas_size)
 
     def make_selection_visible(self):
         self.__make_selection_visible(True)
 
+    def __move_selection(self, step: int, extend: bool) -> None:
+        """Move the selection by step indexes, extending it if requested, and scroll it into view."""
+        selection = self.__selection
+        item_count = self.__delegate.item_count
+        new_index = None
+        selection_bounds = self.__get_selection_bounds()
+        if selection_bounds is not None:
+            min_index, max_index = selection_bounds
+            if step < 0:
+                new_index = max(min_index + step, 0)
+            else:
+                new_index = min(max_index + step, item_count - 1)
+        elif item_count > 0:
+            new_index = item_count - 1 if step < 0 else 0
+        if new_index is not None:
+            if extend:
+                selection.extend(new_index)
+            else:
+                selection.set(new_index)
+        self.__make_selection_visible(top=step < 0)
+
     def key_pressed(self, key):
-        canvas_size = self.canvas_size
-        item_size = self.__calculate_item_size(canvas_size)
-        item_count = self.__delegate.item_count if self.__delegate else 0
-        items_per_row = max(1, int(canvas_size.width / item_size.width) if self.wrap else item_count)
-        items_per_column = max(1, int(canvas_size.height / item_size.height) if self.wrap else item_count)
-        if self.__delegate:
-            if self.__delegate.on_key_pressed:
-                if self.__delegate.on_key_pressed(key):
+        delegate = self.__delegate
+        if delegate:
+            if delegate.on_key_pressed:
+                if delegate.on_key_pressed(key):
                     return True
             if key.is_delete:
-                if self.__delegate.on_delete_pressed:
-                    self.__delegate.on_delete_pressed()
-                return True
-            if key.is_up_arrow:
-                new_index = None
-                indexes = self.__selection.indexes
-                if len(indexes) > 0:
-                    if self.direction == Direction.Row:
-                        new_index = max(min(indexes) - items_per_row, 0)
-                    else:
-                        new_index = max(min(indexes) - 1, 0)
-                elif self.__delegate.item_count > 0:
-                    new_index = self.__delegate.item_count - 1
-                if new_index is not None:
-                    if key.modifiers.shift:
-                        self.__selection.extend(new_index)
-                    else:
-                        self.__selection.set(new_index)
-                self.__make_selection_visible(top=True)
-                return True
-            if key.is_down_arrow:
-                new_index = None
-                indexes = self.__selection.indexes
-                if len(indexes) > 0:
-                    if self.direction == Direction.Row:
-                        new_index = min(max(indexes) + items_per_row, self.__delegate.item_count - 1)
-                    else:
-                        new_index = min(max(indexes) + 1, self.__delegate.item_count - 1)
-                elif self.__delegate.item_count > 0:
-                    new_index = 0
-                if new_index is not None:
-                    if key.modifiers.shift:
-                        self.__selection.extend(new_index)
-                    else:
-                        self.__selection.set(new_index)
-                self.__make_selection_visible(top=False)
-                return True
-            if key.is_left_arrow:
-                new_index = None
-                indexes = self.__selection.indexes
-                if len(indexes) > 0:
-                    if self.direction == Direction.Row:
-                        new_index = max(min(indexes) - 1, 0)
-                    else:
-                        new_index = max(min(indexes) - items_per_column, 0)
-                elif self.__delegate.item_count > 0:
-                    new_index = self.__delegate.item_count - 1
-                if new_index is not None:
-                    if key.modifiers.shift:
-                        self.__selection.extend(new_index)
-                    else:
-                        self.__selection.set(new_index)
-                self.__make_selection_visible(top=True)
-                return True
-            if key.is_right_arrow:
-                new_index = None
-                indexes = self.__selection.indexes
-                if len(indexes) > 0:
-                    if self.direction == Direction.Row:
-                        new_index = min(max(indexes) + 1, self.__delegate.item_count - 1)
-                    else:
-                        new_index = min(max(indexes) + items_per_column, self.__delegate.item_count - 1)
-                elif self.__delegate.item_count > 0:
-                    new_index = 0
-                if new_index is not None:
-                    if key.modifiers.shift:
-                        self.__selection.extend(new_index)
-                    else:
-                        self.__selection.set(new_index)
-                self.__make_selection_visible(top=False)
+                if delegate.on_delete_pressed:
+                    delegate.on_delete_pressed()
                 return True
+            canvas_size = self.canvas_size
+            item_count = delegate.item_count
+            item_width, item_height, items_per_row, items_per_column = self.__get_layout(canvas_size.width, canvas_size.height, item_count)
+            row_stride, column_stride = _index_strides(self.direction, items_per_row, items_per_column)
+            # up and down move by a row, left and right by a column.
+            arrow_steps = ((key.is_up_arrow, -row_stride), (key.is_down_arrow, row_stride),
+                           (key.is_left_arrow, -column_stride), (key.is_right_arrow, column_stride))
+            for is_arrow, step in arrow_steps:
+                if is_arrow:
+                    self.__move_selection(step, key.modifiers.shift)
+                    return True
         return super().key_pressed(key)
 
     def handle_select_all(self):
         if self.__delegate:
-            self.__selection.set_multiple(set(range(self.__delegate.item_count)))
+            # set_multiple copies the indexes into its own set, so pass the range rather than building a set here.
+            self.__selection.set_multiple(range(self.__delegate.item_count))
             return True
         return False
 
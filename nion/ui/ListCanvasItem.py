@@ -6,10 +6,6 @@
     TODO: ListCanvasItem should allow drag selection to select multiple
 """
 
-# futures
-from __future__ import absolute_import
-from __future__ import division
-
 # standard libraries
 # none
 
@@ -1,8 +1,12 @@
 # standard libraries
+import base64
+import io
 import unittest
+import xml.etree.ElementTree
 
 # third party libraries
 import numpy
+import PIL.Image
 
 # local libraries
 from nion.ui import DrawingContext
@@ -24,3 +28,79 @@ class TestImageClass(unittest.TestCase):
         color_map_data[:] = 0xFF010203
         dc.draw_data(data, 0, 0, 4, 4, 0, 1, color_map_data)
         dc.to_svg(Geometry.IntSize(4, 4), Geometry.IntRect.from_tlbr(0, 0, 4, 4))
+
+    def test_svg_encodes_several_images_and_reuses_them_for_other_sizes(self):
+
+        def get_image_pixels(svg):
+            image_elements = xml.etree.ElementTree.fromstring(svg).findall("{http://www.w3.org/2000/svg}image")
+            hrefs = [image_element.get("{http://www.w3.org/1999/xlink}href") for image_element in image_elements]
+            return [numpy.asarray(PIL.Image.open(io.BytesIO(base64.b64decode(href.split(",", 1)[1]))).convert("RGBA")) for href in hrefs]
+
+        dc = DrawingContext.DrawingContext()
+        image0 = numpy.full((2, 3), 0xFF102030, numpy.uint32)
+        image1 = numpy.full((3, 2), 0x80405060, numpy.uint32)
+        data = numpy.zeros((2, 2), numpy.float32)
+        data[0, 0] = 1.0
+        dc.draw_image(image0, 0, 0, 3, 2)
+        dc.draw_image(image1, 0, 0, 2, 3)
+        dc.draw_data(data, 0, 0, 2, 2, 0, 1, None)
+        viewbox = Geometry.IntRect.from_tlbr(0, 0, 4, 4)
+        svg = dc.to_svg(Geometry.IntSize(4, 4), viewbox)
+        image_pixels = get_image_pixels(svg)
+        self.assertEqual(3, len(image_pixels))
+        self.assertTrue(numpy.array_equal(numpy.full((2, 3, 4), (0x10, 0x20, 0x30, 0xFF), numpy.uint8), image_pixels[0]))
+        self.assertTrue(numpy.array_equal(numpy.full((3, 2, 4), (0x40, 0x50, 0x60, 0x80), numpy.uint8), image_pixels[1]))
+        self.assertEqual([[255, 0], [0, 0]], image_pixels[2][..., 0].tolist())
+        self.assertTrue(numpy.all(image_pixels[2][..., 3] == 255))
+        # drawn images are not expected to change; a new size reuses the payloads encoded for the first one.
+        image0[:] = 0
+        for pixels, new_pixels in zip(image_pixels, get_image_pixels(dc.to_svg(Geometry.IntSize(8, 8), viewbox))):
+            self.assertTrue(numpy.array_equal(pixels, new_pixels))
+
+    def test_identical_gradients_share_one_svg_definition(self):
+        dc = DrawingContext.DrawingContext()
+        for i in range(3):
+            gradient = dc.create_linear_gradient(10, 20, 0, 0, 0, 20)
+            gradient.add_color_stop(0.0, "#000")
+            gradient.add_color_stop(1.0, "#FFF")
+            dc.fill_style = gradient
+            dc.fill()
+        svg = dc.to_svg(Geometry.IntSize(4, 4), Geometry.IntRect.from_tlbr(0, 0, 4, 4))
+        self.assertEqual(1, svg.count("<linearGradient"))
+        self.assertEqual(2, svg.count("<stop"))
+
+    def test_to_svg_reflects_commands_added_after_previous_call(self):
+        dc = DrawingContext.DrawingContext()
+        size = Geometry.IntSize(4, 4)
+        viewbox = Geometry.IntRect.from_tlbr(0, 0, 4, 4)
+        dc.begin_path()
+        dc.rect(0, 0, 1, 1)
+        dc.fill_style = "red"
+        dc.fill()
+        svg = dc.to_svg(size, viewbox)
+        self.assertIs(svg, dc.to_svg(size, viewbox))
+        self.assertEqual(1, svg.count("<path"))
+        dc.fill()
+        self.assertEqual(2, dc.to_svg(size, viewbox).count("<path"))
+        dc.clear()
+        self.assertEqual(0, dc.to_svg(size, viewbox).count("<path"))
+
+    def test_svg_with_quoted_font_family_is_well_formed(self):
+        dc = DrawingContext.DrawingContext()
+        dc.font = "12px 'Times'"
+        dc.fill_style = "red"
+        dc.fill_text("a < b", 0, 0)
+        svg = dc.to_svg(Geometry.IntSize(4, 4), Geometry.IntRect.from_tlbr(0, 0, 4, 4))
+        text_element = xml.etree.ElementTree.fromstring(svg).find("{http://www.w3.org/2000/svg}text")
+        self.assertEqual("'Times'", text_element.get("font-family"))
+        self.assertEqual("a < b", text_element.text)
+
+    def test_svg_with_quoted_gradient_stop_color_is_well_formed(self):
+        dc = DrawingContext.DrawingContext()
+        gradient = dc.create_linear_gradient(10, 20, 0, 0, 0, 20)
+        gradient.add_color_stop(0.0, "a'b")
+        dc.fill_style = gradient
+        dc.fill()
+        svg = dc.to_svg(Geometry.IntSize(4, 4), Geometry.IntRect.from_tlbr(0, 0, 4, 4))
+        stop_element = xml.etree.ElementTree.fromstring(svg).find(".//{http://www.w3.org/2000/svg}stop")
+        self.assertEqual("a'b", stop_element.get("stop-color"))
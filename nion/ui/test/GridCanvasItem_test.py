@@ -6,6 +6,7 @@ import unittest
 
 # local libraries
 from nion.ui import CanvasItem
+from nion.ui import DrawingContext
 from nion.ui import GridCanvasItem
 from nion.utils import Geometry
 from nion.utils import Selection
@@ -14,11 +15,19 @@ from nion.utils import Selection
 class GridCanvasItemDelegate:
     def __init__(self, item_count=None):
         self.__item_count = item_count if item_count is not None else 4
+        self.painted_items = list()
 
     @property
     def item_count(self):
         return self.__item_count
 
+    @property
+    def items(self):
+        return list(range(self.__item_count))
+
+    def paint_item(self, drawing_context, item, rect, is_selected):
+        self.painted_items.append((item, rect))
+
     def on_drag_started(self, mouse_index, x, y, modifiers):
         pass
 
@@ -58,3 +67,25 @@ class TestGridCanvasItemClass(unittest.TestCase):
         canvas_item = GridCanvasItem.GridCanvasItem(delegate, selection, wrap=False)
         canvas_item.update_layout((0, 0), (40, 500))
         self.assertEqual(canvas_item.canvas_bounds.height, 40)
+
+    def test_repaint_paints_each_item_once_within_canvas(self):
+        selection = Selection.IndexedSelection()
+        delegate = GridCanvasItemDelegate(7)
+        canvas_item = GridCanvasItem.GridCanvasItem(delegate, selection)
+        canvas_item.update_layout((0, 0), (400, 330))
+        canvas_item._repaint_visible(DrawingContext.DrawingContext(), canvas_item.canvas_bounds)
+        self.assertEqual([item for item, rect in delegate.painted_items], list(range(7)))
+        for item, rect in delegate.painted_items:
+            self.assertLessEqual(rect.right, canvas_item.canvas_size.width)
+
+    def test_selected_items_are_highlighted_with_a_single_fill(self):
+        selection = Selection.IndexedSelection()
+        selection.set_multiple({0, 2, 5})
+        delegate = GridCanvasItemDelegate(7)
+        canvas_item = GridCanvasItem.GridCanvasItem(delegate, selection)
+        canvas_item.update_layout((0, 0), (400, 330))
+        drawing_context = DrawingContext.DrawingContext()
+        canvas_item._repaint_visible(drawing_context, canvas_item.canvas_bounds)
+        commands = [command[0] for command in drawing_context.commands]
+        self.assertEqual(commands.count("rect"), 3)
+        self.assertEqual(commands.count("fill"), 1)